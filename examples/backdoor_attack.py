@@ -13,14 +13,14 @@ if __name__ == '__main__':
     trojanvision.trainer.add_argument(parser)
     trojanvision.marks.add_argument(parser)
     trojanvision.attacks.add_argument(parser)
-    args = parser.parse_args()
+    kwargs = parser.parse_args().__dict__
 
-    env = trojanvision.environ.create(**args.__dict__)
-    dataset = trojanvision.datasets.create(**args.__dict__)
-    model = trojanvision.models.create(dataset=dataset, **args.__dict__)
-    trainer = trojanvision.trainer.create(dataset=dataset, model=model, **args.__dict__)
-    mark = trojanvision.marks.create(dataset=dataset, **args.__dict__)
-    attack = trojanvision.attacks.create(dataset=dataset, model=model, mark=mark, **args.__dict__)
+    env = trojanvision.environ.create(**kwargs)
+    dataset = trojanvision.datasets.create(**kwargs)
+    model = trojanvision.models.create(dataset=dataset, **kwargs)
+    trainer = trojanvision.trainer.create(dataset=dataset, model=model, **kwargs)
+    mark = trojanvision.marks.create(dataset=dataset, **kwargs)
+    attack = trojanvision.attacks.create(dataset=dataset, model=model, mark=mark, **kwargs)
 
     if env['verbose']:
         trojanvision.summary(env=env, dataset=dataset, model=model, mark=mark, trainer=trainer, attack=attack)
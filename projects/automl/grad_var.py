@@ -3,8 +3,8 @@
 import trojanvision
 
 import torch
-import numpy as np
 import argparse
+from torch.func import functional_call, grad, vmap
 
 import time
 
@@ -13,51 +13,54 @@ if __name__ == '__main__':
     trojanvision.environ.add_argument(parser)
     trojanvision.datasets.add_argument(parser)
     trojanvision.models.add_argument(parser)
-    args = parser.parse_args()
+    kwargs = parser.parse_args().__dict__
 
-    env = trojanvision.environ.create(**args.__dict__)
-    dataset = trojanvision.datasets.create(**args.__dict__)
-    model = trojanvision.models.create(dataset=dataset, **args.__dict__)
+    env = trojanvision.environ.create(**kwargs)
+    dataset = trojanvision.datasets.create(**kwargs)
+    model = trojanvision.models.create(dataset=dataset, **kwargs)
 
     if env['verbose']:
         trojanvision.summary(env=env, dataset=dataset, model=model)
     # loss, acc1 = model._validate()
 
-    model.activate_params(model.parameters())
-    model.zero_grad()
+    model.eval()
+    module = model._model
+    params = {k: v.detach() for k, v in module.named_parameters()}
+    buffers = {k: v.detach() for k, v in module.named_buffers()}
+    num_params = sum(v.numel() for v in params.values())
+
+    def sample_loss(params: dict[str, torch.Tensor],
+                    buffers: dict[str, torch.Tensor],
+                    _input: torch.Tensor, _label: torch.Tensor
+                    ) -> torch.Tensor:
+        _output = functional_call(module, (params, buffers),
+                                  (_input.unsqueeze(0),))
+        return model.criterion(_output, _label.unsqueeze(0))
+    # per-sample gradients of a whole batch in one forward/backward
+    sample_grad = vmap(grad(sample_loss), in_dims=(None, None, 0, 0))
 
     torch.random.manual_seed(int(time.time()))
-    grad_x = None
-    grad_xx = None
+    grad_x = torch.zeros(num_params, device=env['device'])
+    grad_xx = torch.zeros(num_params, device=env['device'])
     n_sample = 512
+    batch_size = 32
 
     loader = dataset.get_dataloader('valid', shuffle=True,
-                                    batch_size=1, drop_last=True)
+                                    batch_size=batch_size, drop_last=True)
     for i, data in enumerate(loader):
-        if i >= n_sample:
+        if i >= n_sample // batch_size:
             break
         _input, _label = model.get_data(data)
-        loss = model.loss(_input, _label)
-        loss.backward()
-        grad_temp_list = []
-        for param in model.parameters():
-            grad_temp_list.append(param.grad.flatten())
-        grad = torch.cat(grad_temp_list)
-        grad = grad if grad.norm(p=2) <= 5.0 else grad / grad.norm(p=2) * 5.0
-        grad_temp = grad.detach().cpu().clone()
-        if grad_x is None:
-            grad_x = grad_temp / n_sample
-            grad_xx = grad_temp.square() / n_sample
-        else:
-            grad_x += grad_temp / n_sample
-            grad_xx += grad_temp.square() / n_sample
-        model.zero_grad()
-
-    model.eval()
-    model.activate_params([])
+        grad_dict: dict[str, torch.Tensor] = sample_grad(
+            params, buffers, _input, _label)
+        grad_temp = torch.cat([g.flatten(start_dim=1)
+                               for g in grad_dict.values()], dim=1)
+        # clip each per-sample gradient to L2 norm 5.0
+        grad_temp = grad_temp * (
+            5.0 / grad_temp.norm(p=2, dim=1, keepdim=True)).clamp(max=1.0)
+        grad_x += grad_temp.sum(dim=0) / n_sample
+        grad_xx += grad_temp.square().sum(dim=0) / n_sample
 
-    grad_tensor = trojanvision.to_numpy(grad_xx - grad_x.square())
-    grad_tensor[grad_tensor < 0] = 0
-    var = float(np.sum(np.sqrt(grad_tensor)))
+    var = float((grad_xx - grad_x.square()).clamp_min_(0).sqrt_().sum())
 
     print(f'{model.name:20}  {var:f}')
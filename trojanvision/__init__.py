@@ -1,15 +1,26 @@
 #!/usr/bin/env python3
 
-from trojanvision import environ as environ
-from trojanvision import datasets as datasets
-from trojanvision import models as models
-from trojanvision import trainer as trainer
-
-from trojanvision import attacks as attacks
-from trojanvision import defenses as defenses
-from trojanvision import marks as marks
-
 from trojanzoo import __version__
 from trojanzoo import summary, to_tensor, to_numpy, to_list
+import importlib
+
+from types import ModuleType
 
 __all__ = ['summary', 'to_tensor', 'to_numpy', 'to_list']
+
+# PEP 562: submodules are imported on first attribute access,
+# so scripts that never touch attacks/defenses/marks don't import them.
+_lazy_modules = ['environ', 'datasets', 'models', 'trainer',
+                 'attacks', 'defenses', 'marks']
+
+
+def __getattr__(name: str) -> ModuleType:
+    if name in _lazy_modules:
+        module = importlib.import_module(f'.{name}', __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals().keys()) + _lazy_modules)
@@ -161,7 +161,7 @@ class BypassEmbed(BadNet):
                 out_d = D(out_f)
                 loss_d = self.model.criterion(out_d, _label)
 
-                acc1 = self.model.accuracy(out_d, _label, topk=(1, ))[0]
+                acc1 = float(self.model.accuracy(out_d, _label, topk=(1, ))[0])
                 batch_size = int(_label.size(0))
                 losses.update(loss_d.item(), batch_size)
                 top1.update(acc1, batch_size)
@@ -8,6 +8,7 @@ import numpy as np
 import math
 import random
 import os
+import warnings
 import argparse
 from typing import Callable
 
@@ -36,6 +37,9 @@ class PoisonBasic(Attack):
         self.temp_label: torch.Tensor = None
 
         self.poison_num = self.dataset.batch_size * self.poison_percent
+        if self.dataset.mixupcutmix is not None:
+            warnings.warn('mixup/cutmix is not applied to batches poisoned '
+                          'in get_data().')
 
     def attack(self, epochs: int, **kwargs):
         # model._validate()
@@ -107,7 +111,7 @@ class PoisonBasic(Attack):
     def validate_target(self, indent: int = 0, verbose=True) -> tuple[float, float]:
         self.model.eval()
         _output = self.model(self.temp_input)
-        target_acc, _ = self.model.accuracy(_output, self.temp_label, topk=(1, 5))
+        target_acc = float(self.model.accuracy(_output, self.temp_label, topk=(1, 5))[0])
         target_conf = float(self.model.get_target_prob(self.temp_input, self.temp_label).mean())
         target_loss = self.model.loss(self.temp_input, self.temp_label)
         if verbose:
@@ -10,6 +10,7 @@ import torch
 import math
 import random
 import os
+import warnings
 import argparse
 from typing import Callable
 from typing import TYPE_CHECKING
@@ -37,6 +38,9 @@ class PoisonRandom(Attack):
         self.poison_percent: float = poison_percent
         self.poison_num = self.dataset.batch_size * self.poison_percent
         self.train_mode: str = train_mode
+        if train_mode == 'batch' and self.dataset.mixupcutmix is not None:
+            warnings.warn('mixup/cutmix is not applied to batches poisoned '
+                          'in get_data(); use --train_mode dataset instead.')
 
     def attack(self, epochs: int, save=False, **kwargs):
         if self.train_mode == 'batch':
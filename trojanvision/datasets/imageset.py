@@ -13,6 +13,7 @@ import torchvision.transforms as transforms
 from torch.utils.data.dataloader import default_collate
 import argparse
 import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 
 from typing import TYPE_CHECKING
 from typing import Iterable
@@ -23,6 +24,28 @@ if TYPE_CHECKING:
     import torch.utils.data
 
 
+def _save_images(tasks: list[tuple[Image.Image, str]]) -> None:
+    for image, path in tasks:
+        image.save(path)
+
+
+def _first_item(batch: list):
+    return batch[0]
+
+
+def _collate_long_label(batch: Iterable) -> Iterable:
+    r"""Call :any:`default_collate` and cast integer labels (``data[1]``)
+    to ``torch.long`` once on CPU, so :meth:`ImageSet.get_data`
+    needs no dtype conversion on device."""
+    data = default_collate(batch)
+    if isinstance(data, (list, tuple)) and len(data) > 1 \
+            and isinstance(data[1], torch.Tensor) \
+            and not data[1].is_floating_point() \
+            and data[1].dtype != torch.long:
+        data = type(data)([data[0], data[1].long(), *data[2:]])
+    return data
+
+
 class ImageSet(Dataset):
 
     name: str = 'imageset'
@@ -46,6 +69,9 @@ class ImageSet(Dataset):
         group.add_argument('--cutmix_alpha', type=float, help='cutmix alpha (default: 0.0)')
         group.add_argument('--cutout', action='store_true', help='use cutout')
         group.add_argument('--cutout_length', type=int, help='cutout length')
+        group.add_argument('--channels_last', action='store_true',
+                           help='use torch.channels_last memory format for 4D image batches '
+                           '(model weights are converted accordingly)')
         return group
 
     def __init__(self, norm_par: dict[str, list[float]] = None,
@@ -55,6 +81,7 @@ class ImageSet(Dataset):
                  mixup: bool = False, mixup_alpha: float = 0.0,
                  cutmix: bool = False, cutmix_alpha: float = 0.0,
                  cutout: bool = False, cutout_length: int = None,
+                 channels_last: bool = False,
                  **kwargs):
         self.norm_par: dict[str, list[float]] = norm_par
         self.normalize = normalize
@@ -66,21 +93,21 @@ class ImageSet(Dataset):
         self.cutmix_alpha = cutmix_alpha
         self.cutout = cutout
         self.cutout_length = cutout_length
+        self.channels_last = channels_last
+        self._transform_cache: dict[tuple[str, bool], transforms.Compose] = {}
 
-        self.collate_fn: Callable[[Iterable[torch.Tensor]], Iterable[torch.Tensor]] = None
+        self.collate_fn: Callable[[Iterable[torch.Tensor]], Iterable[torch.Tensor]] = _collate_long_label
+        # mixup/cutmix are applied on device in get_data(mode='train')
+        self.mixupcutmix: Callable[[torch.Tensor, torch.Tensor], tuple[torch.Tensor, torch.Tensor]] = None
         mixup_transforms = []
         if mixup:
             mixup_transforms.append(RandomMixup(self.num_classes, p=1.0, alpha=mixup_alpha))
         if cutmix:
             mixup_transforms.append(RandomCutmix(self.num_classes, p=1.0, alpha=cutmix_alpha))
         if len(mixup_transforms):
-            mixupcutmix = mixup_transforms[0] if len(mixup_transforms) == 1 \
+            self.mixupcutmix = mixup_transforms[0] if len(mixup_transforms) == 1 \
                 else transforms.RandomChoice(mixup_transforms)
 
-            def collate_fn(batch: Iterable[torch.Tensor]) -> Iterable[torch.Tensor]:
-                return mixupcutmix(*default_collate(batch))  # noqa: E731
-            self.collate_fn = collate_fn
-
         super().__init__(default_model=default_model, **kwargs)
         self.param_list['imageset'] = ['data_shape', 'norm_par',
                                        'normalize', 'transform',
@@ -92,12 +119,19 @@ class ImageSet(Dataset):
             self.param_list['imageset'].append('mixup_alpha')
         if cutmix:
             self.param_list['imageset'].append('cutmix_alpha')
+        if channels_last:
+            self.param_list['imageset'].append('channels_last')
 
     def get_transform(self, mode: str, normalize: bool = None
                       ) -> transforms.Compose:
         normalize = normalize if normalize is not None else self.normalize
+        key = (mode, bool(normalize))
+        if key in self._transform_cache:
+            return self._transform_cache[key]
         if self.transform == 'bit':
-            return get_transform_bit(mode, self.data_shape)
+            transform = get_transform_bit(mode, self.data_shape)
+            self._transform_cache[key] = transform
+            return transform
         elif self.data_shape == [3, 224, 224]:
             transform = get_transform_imagenet(
                 mode, use_tuple=self.transform != 'pytorch',
@@ -112,13 +146,27 @@ class ImageSet(Dataset):
         if normalize and self.norm_par is not None:
             transform.transforms.append(transforms.Normalize(
                 mean=self.norm_par['mean'], std=self.norm_par['std']))
+        self._transform_cache[key] = transform
         return transform
 
     def get_dataloader(self, mode: str = None, dataset: Dataset = None,
                        batch_size: int = None, shuffle: bool = None,
                        num_workers: int = None, pin_memory=True,
                        drop_last=False, collate_fn=None,
+                       persistent_workers: bool = True,
+                       prefetch_factor: int = None,
                        **kwargs) -> torch.utils.data.DataLoader:
+        r"""Get dataloader. Call :meth:`get_dataset()` if :attr:`dataset` is not provided.
+
+        Args:
+            persistent_workers (bool): Keep worker processes alive across epochs.
+                Only takes effect when ``num_workers > 0``.
+                Defaults to ``True``.
+            prefetch_factor (int): Number of batches loaded in advance by each worker.
+                Only valid when ``num_workers > 0``.
+                If ``None``, use ``4`` when ``num_workers > 0``.
+                Defaults to ``None``.
+        """
         if batch_size is None:
             batch_size = self.test_batch_size if mode == 'test' \
                 else self.batch_size
@@ -131,38 +179,80 @@ class ImageSet(Dataset):
         if env['num_gpus'] == 0:
             pin_memory = False
         collate_fn = collate_fn or self.collate_fn
+        worker_kwargs = {}
+        if num_workers > 0:
+            worker_kwargs['persistent_workers'] = persistent_workers
+            worker_kwargs['prefetch_factor'] = prefetch_factor or 4
+        elif prefetch_factor is not None:
+            raise ValueError('prefetch_factor is only valid when num_workers > 0, '
+                             f'but got {prefetch_factor=} and {num_workers=}')
+        if pin_memory and isinstance(env['device'], torch.device):
+            worker_kwargs['pin_memory_device'] = str(env['device'])
         return torch.utils.data.DataLoader(
             dataset, batch_size=batch_size, shuffle=shuffle,
             num_workers=num_workers, pin_memory=pin_memory,
-            drop_last=drop_last, collate_fn=collate_fn)
+            drop_last=drop_last, collate_fn=collate_fn, **worker_kwargs)
 
-    @staticmethod
-    def get_data(data: tuple[torch.Tensor, torch.Tensor],
-                 **kwargs) -> tuple[torch.Tensor, torch.Tensor]:
-        return (data[0].to(env['device'], non_blocking=True),
-                data[1].to(env['device'], dtype=torch.long, non_blocking=True))
+    def get_data(self, data: tuple[torch.Tensor, torch.Tensor],
+                 mode: str = None, **kwargs) -> tuple[torch.Tensor, torch.Tensor]:
+        memory_format = torch.channels_last \
+            if self.channels_last and data[0].dim() == 4 \
+            else torch.preserve_format
+        _input = data[0].to(env['device'], non_blocking=True,
+                            memory_format=memory_format)
+        _label = data[1].to(env['device'], non_blocking=True)
+        if mode == 'train' and self.mixupcutmix is not None:
+            _input, _label = self.mixupcutmix(_input, _label)
+        return _input, _label
 
     def get_class_to_idx(self, **kwargs) -> dict[str, int]:
         if hasattr(self, 'class_to_idx'):
             return getattr(self, 'class_to_idx')
         return {str(i): i for i in range(self.num_classes)}
 
-    def make_folder(self, img_type: str = '.png', **kwargs):
+    def make_folder(self, img_type: str = '.png', max_workers: int = None,
+                    **kwargs):
         mode_list: list[str] = [
             'train', 'valid'] if self.valid_set else ['train']
         class_to_idx = self.get_class_to_idx(**kwargs)
         idx_to_class = {v: k for k, v in class_to_idx.items()}
+        max_workers = max_workers or os.cpu_count()
+        chunksize = 64
         for mode in mode_list:
             dataset: VisionDataset = self.get_org_dataset(mode, transform=None)
-            class_counters = [0] * self.num_classes
-            for image, target_class in list(dataset):
-                image: Image.Image
-                target_class: int
-                class_name = idx_to_class[target_class]
+            # stream samples (read in parallel by workers)
+            # instead of materializing the whole dataset
+            loader = torch.utils.data.DataLoader(
+                dataset, batch_size=1, num_workers=self.num_workers,
+                collate_fn=_first_item)
+            class_dirs: dict[int, str] = {}
+            for target_class, class_name in idx_to_class.items():
                 _dir = os.path.join(
                     self.folder_path, self.name, mode, class_name)
-                if not os.path.exists(_dir):
-                    os.makedirs(_dir)
-                image.save(os.path.join(
-                    _dir, f'{class_counters[target_class]}{img_type}'))
-                class_counters[target_class] += 1
+                os.makedirs(_dir, exist_ok=True)
+                class_dirs[target_class] = _dir
+            class_counters = [0] * self.num_classes
+            tasks: list[tuple[Image.Image, str]] = []
+            futures: set[Future] = set()
+            # PIL encoding and disk writes are independent per image
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                for image, target_class in loader:
+                    image: Image.Image
+                    target_class: int
+                    tasks.append((image, os.path.join(
+                        class_dirs[target_class],
+                        f'{class_counters[target_class]}{img_type}')))
+                    class_counters[target_class] += 1
+                    if len(tasks) >= chunksize:
+                        futures.add(executor.submit(_save_images, tasks))
+                        tasks = []
+                    # bound the number of images held in memory
+                    if len(futures) >= 2 * max_workers:
+                        done, futures = wait(futures,
+                                             return_when=FIRST_COMPLETED)
+                        for future in done:
+                            future.result()
+                if tasks:
+                    futures.add(executor.submit(_save_images, tasks))
+                for future in futures:
+                    future.result()
@@ -134,6 +134,9 @@ class ImageModel(Model):
         args = {'padding': 3} if 'vgg' in name else {}  # TODO: so ugly
         set_first_layer_channel(self._model.features,
                                 channel=data_shape[0], **args)
+        if isinstance(dataset, ImageSet) and dataset.channels_last:
+            # conv weights should match the channels_last inputs
+            self._model.to(memory_format=torch.channels_last)
 
         self.sgm: bool = sgm
         self.sgm_gamma: float = sgm_gamma
@@ -260,6 +263,8 @@ class ImageModel(Model):
                grad_clip: float = None, pre_conditioner: Union[KFAC, EKFAC] = None,
                print_prefix: str = 'Epoch', start_epoch: int = 0, resume: int = 0,
                validate_interval: int = 10, save: bool = False, amp: bool = False,
+               empty_cache_interval: int = 0,
+               compile: bool = False,
                loader_train: torch.utils.data.DataLoader = None,
                loader_valid: torch.utils.data.DataLoader = None,
                epoch_fn: Callable[..., None] = None,
@@ -332,6 +337,8 @@ class ImageModel(Model):
                        print_prefix=print_prefix, start_epoch=start_epoch,
                        resume=resume, validate_interval=validate_interval,
                        save=save, amp=amp,
+                       empty_cache_interval=empty_cache_interval,
+                       compile=compile,
                        loader_train=loader_train, loader_valid=loader_valid,
                        epoch_fn=epoch_fn, get_data_fn=get_data_fn,
                        loss_fn=loss_fn, after_loss_fn=after_loss_fn,
@@ -196,7 +196,7 @@ class DARTS(ImageModel):
 
     def get_data(self, data: tuple[torch.Tensor, torch.Tensor], adv_train: bool = False,
                  mode: str = 'train', **kwargs) -> tuple[torch.Tensor, torch.Tensor]:
-        _input, _label = super().get_data(data, adv_train=adv_train, **kwargs)
+        _input, _label = super().get_data(data, adv_train=adv_train, mode=mode, **kwargs)
         if self.arch_search and mode == 'train':
             data_valid = next(iter(self.dataset.loader['train3']))
             input_valid, label_valid = super().get_data(data_valid, adv_train=adv_train, **kwargs)
@@ -217,6 +217,8 @@ class DARTS(ImageModel):
                grad_clip: float = None, pre_conditioner: Union[KFAC, EKFAC] = None,
                print_prefix: str = 'Epoch', start_epoch: int = 0, resume: int = 0,
                validate_interval: int = 10, save: bool = False, amp: bool = False,
+               empty_cache_interval: int = 0,
+               compile: bool = False,
                loader_train: torch.utils.data.DataLoader = None,
                loader_valid: torch.utils.data.DataLoader = None,
                epoch_fn: Callable[..., None] = None,
@@ -242,6 +244,8 @@ class DARTS(ImageModel):
                               print_prefix=print_prefix, start_epoch=start_epoch,
                               resume=resume, validate_interval=validate_interval,
                               save=save, amp=amp,
+                              empty_cache_interval=empty_cache_interval,
+                              compile=compile,
                               loader_train=loader_train, loader_valid=loader_valid,
                               epoch_fn=epoch_fn, get_data_fn=get_data_fn,
                               loss_fn=loss_fn, after_loss_fn=after_loss_fn,
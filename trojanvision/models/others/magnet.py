@@ -101,8 +101,7 @@ class MagNet(Model):
             v_noise = self.v_noise
         _input = data[0]
         if mode == 'train':
-            noise: torch.Tensor = torch.normal(mean=0.0, std=v_noise,
-                                               size=_input.shape)
+            noise = torch.randn_like(_input) * v_noise
             data[0] = (_input + noise).clamp(0.0, 1.0)
             data[1] = _input.detach()
         else:
@@ -120,6 +119,7 @@ class MagNet(Model):
             epochs: int = None, lr_min: float = 0.0,
             lr_warmup_epochs: int = 0, lr_warmup_method: str = 'constant',
             lr_warmup_decay: float = 0.01,
+            fused: bool = False,
             **kwargs) -> tuple[Optimizer, _LRScheduler]:
         return super().define_optimizer(
             parameters=parameters, OptimType=OptimType,
@@ -130,6 +130,7 @@ class MagNet(Model):
             lr_warmup_epochs=lr_warmup_epochs,
             lr_warmup_method=lr_warmup_method,
             lr_warmup_decay=lr_warmup_decay,
+            fused=fused,
             **kwargs)
 
     # define MSE loss function
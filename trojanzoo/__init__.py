@@ -2,14 +2,28 @@
 
 from .version import __version__ as internal_version
 import torch
-
-from trojanzoo import environ as environ
-from trojanzoo import datasets as datasets
-from trojanzoo import models as models
-from trojanzoo import trainer as trainer
+import importlib
 
 from trojanzoo.utils.module import summary
 from trojanzoo.utils.tensor import to_tensor, to_numpy, to_list
 
+from types import ModuleType
+
 __all__ = ['summary', 'to_tensor', 'to_numpy', 'to_list']
 __version__ = torch.__version__
+
+# PEP 562: submodules are imported on first attribute access.
+# torch itself is still imported eagerly above.
+_lazy_modules = ['environ', 'datasets', 'models', 'trainer']
+
+
+def __getattr__(name: str) -> ModuleType:
+    if name in _lazy_modules:
+        module = importlib.import_module(f'.{name}', __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals().keys()) + _lazy_modules)
@@ -14,6 +14,7 @@ from typing import Union    # TODO: python 3.10
 from trojanzoo.configs import Config
 import argparse
 if TYPE_CHECKING:
+    import torch.backends.cuda
     import torch.backends.cudnn
 
 
@@ -37,9 +38,14 @@ class Env(Param):
 
         group.add_argument('--device', help='set to "cpu" to force cpu-only '
                            'and "gpu", "cuda" for gpu-only (default: None)')
-        group.add_argument('--benchmark', action='store_true',
+        group.add_argument('--benchmark', action='store_true', default=None,
                            help='use torch.backends.cudnn.benchmark '
-                           'to accelerate without deterministic')
+                           'to accelerate without deterministic '
+                           '(default: config[env][benchmark]=True)')
+        group.add_argument('--deterministic', action='store_true',
+                           default=None,
+                           help='use deterministic cudnn algorithms, '
+                           'which disables cudnn benchmark and TF32')
         group.add_argument('--verbose', type=int, default=0,
                            help='show arguments and module information '
                            '(default: 0)')
@@ -62,6 +68,7 @@ def add_argument(parser: argparse.ArgumentParser):
 def create(config_path: str = None, dataset_name: str = None,
            dataset: str = None,
            seed: int = None, data_seed: int = None, benchmark: bool = None,
+           deterministic: bool = None,
            config: Config = config,
            cache_threshold: float = None, verbose: int = None,
            color: bool = None, tqdm: bool = None, **kwargs) -> Env:
@@ -100,10 +107,17 @@ def create(config_path: str = None, dataset_name: str = None,
         device = torch.device('cpu')
     if benchmark is None and 'benchmark' in env.keys():
         benchmark = env['benchmark']
-    if benchmark:
-        torch.backends.cudnn.benchmark = benchmark
+    if deterministic is None and 'deterministic' in env.keys():
+        deterministic = env['deterministic']
+    if deterministic:
+        benchmark = False
+        torch.backends.cudnn.deterministic = True
+    torch.backends.cudnn.benchmark = bool(benchmark)
+    torch.backends.cuda.matmul.allow_tf32 = not deterministic
+    torch.backends.cudnn.allow_tf32 = not deterministic
     env.update(seed=seed, device=device,
-               benchmark=benchmark, num_gpus=num_gpus)
+               benchmark=benchmark, deterministic=deterministic,
+               num_gpus=num_gpus)
 
     env['world_size'] = 1   # TODO
     return env
@@ -190,6 +190,7 @@ class Model:
             assert isinstance(model, nn.Module)
             self._model = model
         self.model = self.get_parallel_model(self._model)
+        self.compiled = False
         self.activate_params([])
         if official:
             self.load('official')
@@ -303,9 +304,13 @@ class Model:
             epochs: int = None, lr_min: float = 0.0,
             lr_warmup_epochs: int = 0, lr_warmup_method: str = 'constant',
             lr_warmup_decay: float = 0.01,
+            fused: bool = False,
             **kwargs) -> tuple[Optimizer, _LRScheduler]:
         kwargs['momentum'] = momentum
         kwargs['weight_decay'] = weight_decay
+        if fused and env['num_gpus']:
+            # filtered out below if OptimType doesn't support it
+            kwargs['fused'] = True
         if isinstance(parameters, str):
             parameters = self.get_parameter_from_name(name=parameters)
         if not isinstance(parameters, Iterable):
@@ -484,6 +489,8 @@ class Model:
                grad_clip: float = None, pre_conditioner: Union[KFAC, EKFAC] = None,
                print_prefix: str = 'Epoch', start_epoch: int = 0, resume: int = 0,
                validate_interval: int = 10, save: bool = False, amp: bool = False,
+               empty_cache_interval: int = 0,
+               compile: bool = False,
                loader_train: torch.utils.data.DataLoader = None,
                loader_valid: torch.utils.data.DataLoader = None,
                epoch_fn: Callable[..., None] = None,
@@ -511,6 +518,8 @@ class Model:
             epoch_fn = getattr(self, 'epoch_fn')
         if not callable(after_loss_fn) and hasattr(self, 'after_loss_fn'):
             after_loss_fn = getattr(self, 'after_loss_fn')
+        if compile:
+            self.compile()
         return train(module=self._model, num_classes=self.num_classes,
                      epochs=epochs, optimizer=optimizer, lr_scheduler=lr_scheduler,
                      lr_warmup_epochs=lr_warmup_epochs,
@@ -519,6 +528,7 @@ class Model:
                      print_prefix=print_prefix, start_epoch=start_epoch,
                      resume=resume, validate_interval=validate_interval,
                      save=save, amp=amp,
+                     empty_cache_interval=empty_cache_interval,
                      loader_train=loader_train, loader_valid=loader_valid,
                      epoch_fn=epoch_fn, get_data_fn=get_data_fn,
                      loss_fn=loss_fn, after_loss_fn=after_loss_fn,
@@ -589,7 +599,8 @@ class Model:
 
     def accuracy(self, _output: torch.Tensor, _label: torch.Tensor,
                  num_classes: int = None,
-                 topk: tuple[int] = (1, 5)) -> list[float]:
+                 topk: tuple[int] = (1, 5)
+                 ) -> list[torch.Tensor]:
         num_classes = num_classes if num_classes is not None \
             else self.num_classes
         return accuracy(_output, _label, num_classes, topk)
@@ -608,6 +619,17 @@ class Model:
     def activate_params(self, params: Iterator[nn.Parameter]) -> None:
         return activate_params(self._model, params)
 
+    def compile(self, mode: str = 'reduce-overhead', **kwargs) -> None:
+        r"""Wrap the forward module :attr:`self.model` with
+        :any:`torch.compile` (graph capture, CUDA graphs and kernel fusion).
+        :attr:`self._model` is untouched, so state dicts are unchanged.
+        """
+        if self.compiled:
+            return
+        self.model = torch.compile(self.model, mode=mode, dynamic=False,
+                                   **kwargs)
+        self.compiled = True
+
     # Need to overload for other packages (GNN)
     # since they are calling their own nn.DataParallel.
     # TODO: nn.parallel.DistributedDataParallel
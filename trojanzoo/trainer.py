@@ -51,6 +51,9 @@ class Trainer:
                            '(default: 3e-4)')
         group.add_argument('--nesterov', action='store_true',
                            help='enable nesterov for SGD optimizer')
+        group.add_argument('--fused', action='store_true',
+                           help='use the fused (single kernel) implementation '
+                           'of Optimizer if supported (e.g., Adam, AdamW)')
 
         group.add_argument('--lr_scheduler', action='store_true',
                            help='enable lr scheduler')
@@ -92,6 +95,14 @@ class Trainer:
                            'for mixed precision training')
         group.add_argument('--grad_clip', type=float,
                            help='Gradient Clipping max norms')
+        group.add_argument('--compile', action='store_true',
+                           help='use torch.compile on model forward '
+                           '(mode="reduce-overhead")')
+        group.add_argument('--train_empty_cache_interval', type=int,
+                           dest='empty_cache_interval',
+                           help='call empty_cache() every n training epochs, '
+                           'which empties the cache above --cache_threshold '
+                           '(default: 0, never)')
 
         group.add_argument('--validate_interval', type=int,
                            help='validate interval during training epochs '
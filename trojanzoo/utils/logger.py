@@ -10,7 +10,7 @@ import datetime
 import time
 
 
-from typing import Generator, Iterable, TypeVar    # TODO: python 3.10
+from typing import Generator, Iterable, TypeVar, Union    # TODO: python 3.10
 _T = TypeVar("_T")
 
 __all__ = ['SmoothedValue', 'MetricLogger', 'AverageMeter']
@@ -22,6 +22,10 @@ class SmoothedValue:
 
     https://github.com/pytorch/vision/blob/main/references/classification/utils.py
 
+    Values could be python floats or 0-dim tensors (e.g., ``loss.detach()``).
+    Tensors are kept on their device and only converted to floats
+    (with a single host synchronization) when a property is accessed.
+
     Args:
         window_size (int): The :attr:`maxlen` of :class:`~collections.deque`.
         fmt (str): The format pattern of ``str(self)``.
@@ -30,7 +34,7 @@ class SmoothedValue:
         deque (~collections.deque): The unique data series.
         count (int): The amount of data.
         fmt (str): The string pattern.
-        total (float): The sum of all data.
+        total (float | torch.Tensor): The sum of all data.
 
     :Properties:
         * **median** (*float*): The median of ``deque``.
@@ -47,18 +51,24 @@ class SmoothedValue:
         self.count = 0
         self.fmt = fmt
         self.total = 0.0
+        self._pending = False
 
-    def update(self, value: float, n: int = 1) -> 'SmoothedValue':
+    def update(self, value: Union[float, torch.Tensor],
+               n: int = 1) -> 'SmoothedValue':
         r"""Update :attr:`n` pieces of data with same :attr:`value`
         into :class:`~collections.deque`.
 
         Args:
-            value (float): the value to update.
+            value (float | torch.Tensor): the value to update.
+                0-dim tensors are accumulated lazily without host sync.
             n (int): the number of data with same :attr:`value`.
 
         Returns:
             SmoothedValue: return ``self`` for stream usage.
         """
+        if isinstance(value, torch.Tensor):
+            value = value.detach()
+            self._pending = True
         self.deque.append(value)
         self.count += n
         self.total += value * n
@@ -74,6 +84,9 @@ class SmoothedValue:
             SmoothedValue: return ``self`` for stream usage.
         """
         for value in value_list:
+            if isinstance(value, torch.Tensor):
+                value = value.detach()
+                self._pending = True
             self.deque.append(value)
             self.total += value
         self.count += len(value_list)
@@ -88,6 +101,34 @@ class SmoothedValue:
         self.deque = deque(maxlen=self.deque.maxlen)
         self.count = 0
         self.total = 0.0
+        self._pending = False
+        return self
+
+    def synchronize(self) -> 'SmoothedValue':
+        r"""Convert pending tensor values in ``deque`` and ``total``
+        to python floats with a single host synchronization.
+
+        Returns:
+            SmoothedValue: return ``self`` for stream usage.
+        """
+        if not self._pending:
+            return self
+        values = list(self.deque)
+        idx = [i for i, v in enumerate(values)
+               if isinstance(v, torch.Tensor)]
+        tensors = [values[i].float() for i in idx]
+        if isinstance(self.total, torch.Tensor):
+            tensors.append(self.total.float())
+        if tensors:
+            device = tensors[0].device
+            result: list[float] = torch.stack(
+                [t.to(device) for t in tensors]).tolist()
+            for i, v in zip(idx, result):
+                values[i] = v
+            if isinstance(self.total, torch.Tensor):
+                self.total = result[-1]
+            self.deque = deque(values, maxlen=self.deque.maxlen)
+        self._pending = False
         return self
 
     def synchronize_between_processes(self):
@@ -96,6 +137,7 @@ class SmoothedValue:
         """
         if not (dist.is_available() and dist.is_initialized()):
             return
+        self.synchronize()
         t = torch.tensor([self.count, self.total],
                          dtype=torch.float64, device='cuda')
         dist.barrier()
@@ -106,6 +148,7 @@ class SmoothedValue:
 
     @property
     def median(self) -> float:
+        self.synchronize()
         try:
             d = torch.tensor(list(self.deque))
             return d.median().item()
@@ -114,6 +157,7 @@ class SmoothedValue:
 
     @property
     def avg(self) -> float:
+        self.synchronize()
         try:
             d = torch.tensor(list(self.deque), dtype=torch.float32)
             if len(d) == 0:
@@ -124,6 +168,7 @@ class SmoothedValue:
 
     @property
     def global_avg(self) -> float:
+        self.synchronize()
         try:
             return self.total / self.count
         except Exception:
@@ -131,6 +176,7 @@ class SmoothedValue:
 
     @property
     def max(self) -> float:
+        self.synchronize()
         try:
             return max(self.deque)
         except Exception:
@@ -138,6 +184,7 @@ class SmoothedValue:
 
     @property
     def min(self) -> float:
+        self.synchronize()
         try:
             return min(self.deque)
         except Exception:
@@ -145,6 +192,7 @@ class SmoothedValue:
 
     @property
     def value(self) -> float:
+        self.synchronize()
         try:
             return self.deque[-1]
         except Exception:
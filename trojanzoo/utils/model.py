@@ -173,29 +173,43 @@ def summary(module: nn.Module, depth: int = 0, verbose: bool = True,
 
 
 def activate_params(module: nn.Module, params: Iterator[nn.Parameter]) -> None:
-    module.requires_grad_(False)
-    for param in params:
-        param.requires_grad_()
+    r"""Set ``requires_grad=True`` for :attr:`params`
+    and ``requires_grad=False`` for all other parameters of :attr:`module`.
+    Only parameters whose flag actually changes are written.
+    """
+    params = list(params)
+    target_ids = {id(param) for param in params}
+    for param in module.parameters():
+        requires_grad = id(param) in target_ids
+        if param.requires_grad != requires_grad:
+            param.requires_grad_(requires_grad)
+    for param in params:    # parameters outside module
+        if not param.requires_grad:
+            param.requires_grad_()
 
 
 def accuracy(_output: torch.Tensor, _label: torch.Tensor, num_classes: int,
-             topk: tuple[int] = (1, 5)) -> list[float]:
+             topk: tuple[int] = (1, 5)) -> list[torch.Tensor]:
     r"""Computes the accuracy over the k top predictions
-    for the specified values of k
+    for the specified values of k.
+    Results are 0-dim tensors on :attr:`_output` device
+    (``100.0`` if ``k > num_classes``) to avoid host synchronization.
+    Call :any:`float` on them when a Python number is needed.
     """
     with torch.no_grad():
         maxk = min(max(topk), num_classes)
         batch_size = _label.size(0)
-        _, pred = _output.topk(maxk, 1, True, True)
-        pred = pred.t()
-        correct = pred.eq(_label[None])
-        res: list[float] = []
+        if _label.dim() > 1:    # soft labels (e.g., mixup/cutmix)
+            _label = _label.argmax(dim=1)
+        _, pred = _output.topk(maxk, 1, True, True)    # (N, maxk)
+        correct = pred.eq(_label.view(-1, 1))
+        # accuracy for every k in [1, maxk] with a single reduction
+        acc_k = correct.sum(dim=0, dtype=torch.float32).cumsum(dim=0) \
+            * (100.0 / batch_size)
+        res: list[torch.Tensor] = []
         for k in topk:
-            if k > num_classes:
-                res.append(100.0)
-            else:
-                correct_k = float(correct[:k].sum(dtype=torch.float32))
-                res.append(correct_k * (100.0 / batch_size))
+            res.append(acc_k.new_tensor(100.0) if k > num_classes
+                       else acc_k[k - 1])
         return res
 
 
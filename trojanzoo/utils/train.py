@@ -12,14 +12,78 @@ import torch.nn as nn
 
 from tqdm import tqdm
 
-from typing import Union
+from typing import Any, Union
 from trojanzoo.utils.model import ExponentialMovingAverage
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator
 from torch.optim.optimizer import Optimizer
 from torch.optim.lr_scheduler import _LRScheduler
 import torch.utils.data
 
 
+class CUDAPrefetcher:
+    r"""Wrap a dataloader to copy the next batch to GPU on a side
+    :class:`torch.cuda.Stream` while the current batch is being computed.
+
+    https://github.com/NVIDIA/apex/blob/master/examples/imagenet/main_amp.py
+
+    Tensors (including those nested in :class:`list` and :class:`tuple`)
+    are moved with ``non_blocking=True``, so the loader should use
+    ``pin_memory=True`` to make the copies truly asynchronous.
+    Batches passed to ``get_data_fn`` are therefore already on device,
+    and any tensor it creates should follow the input's device.
+
+    Args:
+        loader (~collections.abc.Iterable): The raw dataloader.
+        device (torch.device): The target device.
+            If ``None``, use ``env['device']``.
+            Defaults to ``None``.
+    """
+    _end = object()
+
+    def __init__(self, loader: Iterable, device: torch.device = None):
+        self.loader = loader
+        self.device = device if device is not None else env['device']
+        self.stream = torch.cuda.Stream()
+
+    def __len__(self) -> int:
+        return len(self.loader)
+
+    def __iter__(self) -> Iterator:
+        loader_iter = iter(self.loader)
+        next_data = self.preload(loader_iter)
+        while next_data is not self._end:
+            torch.cuda.current_stream().wait_stream(self.stream)
+            data = next_data
+            self.record_stream(data)
+            next_data = self.preload(loader_iter)
+            yield data
+
+    def preload(self, loader_iter: Iterator) -> Any:
+        try:
+            data = next(loader_iter)
+        except StopIteration:
+            return self._end
+        self.stream.wait_stream(torch.cuda.current_stream())
+        with torch.cuda.stream(self.stream):
+            return self.to_device(data)
+
+    def to_device(self, data: Any) -> Any:
+        if isinstance(data, torch.Tensor):
+            return data.to(self.device, non_blocking=True)
+        if isinstance(data, (list, tuple)):
+            return type(data)(self.to_device(item) for item in data)
+        return data
+
+    def record_stream(self, data: Any) -> None:
+        # keep the copied memory alive until consumed on the main stream
+        if isinstance(data, torch.Tensor):
+            if data.is_cuda:
+                data.record_stream(torch.cuda.current_stream())
+        elif isinstance(data, (list, tuple)):
+            for item in data:
+                self.record_stream(item)
+
+
 def train(module: nn.Module, num_classes: int,
           epochs: int, optimizer: Optimizer, lr_scheduler: _LRScheduler = None,
           lr_warmup_epochs: int = 0,
@@ -28,6 +92,7 @@ def train(module: nn.Module, num_classes: int,
           grad_clip: float = None, pre_conditioner: Union[KFAC, EKFAC] = None,
           print_prefix: str = 'Epoch', start_epoch: int = 0, resume: int = 0,
           validate_interval: int = 10, save: bool = False, amp: bool = False,
+          empty_cache_interval: int = 0,
           loader_train: torch.utils.data.DataLoader = None,
           loader_valid: torch.utils.data.DataLoader = None,
           epoch_fn: Callable[..., None] = None,
@@ -73,6 +138,9 @@ def train(module: nn.Module, num_classes: int,
     if resume and lr_scheduler:
         for _ in range(resume):
             lr_scheduler.step()
+    # built per call rather than at import as ansi.switch() may change colors
+    header_pattern = ansi['blue_light'] + '{0}: {1}' + ansi['reset']
+    tqdm_prefix = ansi['upline'] + ansi['clear_line']
     for _epoch in range(resume, epochs):
         _epoch += 1
         if callable(epoch_fn):
@@ -84,12 +152,14 @@ def train(module: nn.Module, num_classes: int,
         logger.meters['top1'] = SmoothedValue()
         logger.meters['top5'] = SmoothedValue()
         loader_epoch = loader_train
+        if env['num_gpus']:
+            loader_epoch = CUDAPrefetcher(loader_epoch)
         if verbose:
-            header: str = '{blue_light}{0}: {1}{reset}'.format(
-                print_prefix, output_iter(_epoch, epochs), **ansi)
+            header: str = header_pattern.format(
+                print_prefix, output_iter(_epoch, epochs))
             header = header.ljust(30 + get_ansi_len(header))
             if env['tqdm']:
-                header = '{upline}{clear_line}'.format(**ansi) + header
+                header = tqdm_prefix + header
                 loader_epoch = tqdm(loader_epoch)
             loader_epoch = logger.log_every(
                 loader_epoch, header=header, indent=indent)
@@ -104,7 +174,8 @@ def train(module: nn.Module, num_classes: int,
                 pre_conditioner.track.enable()
             _output = forward_fn(_input, amp=amp)
             loss = loss_fn(_input, _label, _output=_output, amp=amp)
-            optimizer.zero_grad()
+            # pre_conditioner reads module.weight.grad, keep it as tensors
+            optimizer.zero_grad(set_to_none=pre_conditioner is None)
             if amp:
                 scaler.scale(loss).backward()
                 if callable(after_loss_fn):
@@ -149,12 +220,12 @@ def train(module: nn.Module, num_classes: int,
             acc1, acc5 = accuracy_fn(
                 _output, _label, num_classes=num_classes, topk=(1, 5))
             batch_size = int(_label.size(0))
-            logger.meters['loss'].update(float(loss), batch_size)
+            logger.meters['loss'].update(loss.detach(), batch_size)
             logger.meters['top1'].update(acc1, batch_size)
             logger.meters['top5'].update(acc5, batch_size)
-            # TODO: should it be outside of the dataloader loop?
+        optimizer.zero_grad(set_to_none=True)
+        if empty_cache_interval and _epoch % empty_cache_interval == 0:
             empty_cache()
-        optimizer.zero_grad()
         if lr_scheduler and lr_scheduler_freq == 'epochs':
             lr_scheduler.step()
         if change_train_eval:
@@ -195,7 +266,7 @@ def train(module: nn.Module, num_classes: int,
                                 suffix=suffix, verbose=verbose)
                 if verbose:
                     prints('-' * 50, indent=indent)
-    module.zero_grad()
+    module.zero_grad(set_to_none=True)
 
 
 def validate(module: nn.Module, num_classes: int,
@@ -222,6 +293,8 @@ def validate(module: nn.Module, num_classes: int,
     logger.meters['top1'] = SmoothedValue()
     logger.meters['top5'] = SmoothedValue()
     loader_epoch = loader
+    if env['num_gpus']:
+        loader_epoch = CUDAPrefetcher(loader_epoch)
     if verbose:
         header: str = '{yellow}{0}{reset}'.format(print_prefix, **ansi)
         header = header.ljust(
@@ -233,9 +306,9 @@ def validate(module: nn.Module, num_classes: int,
             loader_epoch, header=header, indent=indent)
     for data in loader_epoch:
         _input, _label = get_data_fn(data, mode='valid', **kwargs)
-        with torch.no_grad():
+        with torch.inference_mode():
             _output = forward_fn(_input)
-            loss = float(loss_fn(_input, _label, _output=_output, **kwargs))
+            loss = loss_fn(_input, _label, _output=_output, **kwargs)
             acc1, acc5 = accuracy_fn(
                 _output, _label, num_classes=num_classes, topk=(1, 5))
             batch_size = int(_label.size(0))
@@ -277,7 +350,7 @@ def compare(module1: nn.Module, module2: nn.Module,
             loader_epoch = tqdm(loader_epoch)
         loader_epoch = logger.log_every(
             loader_epoch, header=header, indent=indent)
-    with torch.no_grad():
+    with torch.inference_mode():
         for data in loader_epoch:
             _input, _label = get_data_fn(data, **kwargs)
             _output1: torch.Tensor = module1(_input)